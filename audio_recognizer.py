@@ -4,10 +4,16 @@ Audio Recognition App using Chromaprint + AcoustID
 Recognizes music from audio files or voice recordings
 """
 
+import contextlib
+import functools
 import os
+import shelve
 import sys
 import tempfile
-from typing import Optional, Dict, List
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, Iterator, List, Tuple
 import argparse
 from pathlib import Path
 
@@ -22,7 +28,9 @@ try:
     import acoustid
     import librosa
     import numpy as np
-    from pydub import AudioSegment
+    import requests
+    from requests.adapters import HTTPAdapter
+    import soundfile as sf
     from pydub.silence import split_on_silence
 except ImportError as e:
     print(f"❌ Missing required dependency: {e}")
@@ -31,16 +39,240 @@ except ImportError as e:
     print("                    brew install ffmpeg portaudio            # macOS")
     sys.exit(1)
 
+ACOUSTID_LOOKUP_URL = "https://api.acoustid.org/v2/lookup"
+FINGERPRINT_CACHE_PATH = Path.home() / ".cache" / "audio_recognizer" / "fp.db"
+PREPROCESS_SAMPLE_RATE = 22050
+# Chromaprint works on ~11 kHz chroma features, so the noise-floor estimate
+# does not need 2048-point frequency resolution
+STFT_N_FFT = 512
+STFT_HOP_LENGTH = 256
+# Rolling noise-floor window, about one second of STFT frames
+NOISE_WINDOW_FRAMES = PREPROCESS_SAMPLE_RATE // STFT_HOP_LENGTH
+# Set once the pyfftw plan cache has been enabled
+_fftw_cache_enabled = False
+
+@functools.lru_cache(maxsize=None)
+def _numba_kernels():
+    """
+    Build the fused Numba kernels on first use
+    
+    numba is imported here rather than at module level, so only the denoise
+    path pays for it. librosa itself depends on numba; the NumPy fallbacks
+    exist only for environments where it is missing.
+    
+    Returns:
+        (denoise_stft, clip_to_pcm16), or None without numba
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def denoise_stft(stft, magnitude, noise_floor, out):
+        """
+        Spectral subtraction gain and rescaling fused into one pass
+        
+        Writes the denoised spectrum of `stft` into `out`, which must have
+        the same shape and dtype.
+        """
+        n_freq, n_frames = stft.shape
+        for i in prange(n_freq):
+            for j in range(n_frames):
+                mag = magnitude[i, j]
+                scale = 0.0
+                if mag > 0:
+                    scale = max(mag - 0.3 * noise_floor[i, j], 0.1 * mag) / mag
+                out[i, j] = stft[i, j] * scale
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def clip_to_pcm16(y, out):
+        """
+        Clip to [-1, 1], scale and cast to int16 in one pass
+        """
+        for i in prange(y.shape[0]):
+            out[i] = np.int16(min(max(y[i] * 32767.0, -32767.0), 32767.0))
+    
+    return denoise_stft, clip_to_pcm16
+
+def _to_pcm16(y: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Convert a float signal to 16-bit PCM samples
+    
+    The NumPy fallback scales and clips `y` in place.
+    """
+    if out is None:
+        out = np.empty(y.shape[0], dtype=np.int16)
+    kernels = _numba_kernels()
+    if kernels:
+        _, clip_to_pcm16 = kernels
+        clip_to_pcm16(y, out)
+        return out
+    np.multiply(y, 32767, out=y)
+    np.clip(y, -32767, 32767, out=y)
+    np.copyto(out, y, casting='unsafe')
+    return out
+
 class AudioRecognizer:
-    def __init__(self, acoustid_api_key: str):
+    def __init__(self, acoustid_api_key: str, fingerprint_cache: bool = True):
         """
         Initialize the audio recognizer
         
         Args:
             acoustid_api_key: Your AcoustID API key (get from https://acoustid.org/new-application)
+            fingerprint_cache: Reuse fpcalc results for unchanged files from
+                FINGERPRINT_CACHE_PATH
         """
         self.acoustid_api_key = acoustid_api_key
         
+        # Preprocessing scratch arrays, grown to the largest input seen
+        self._workspace = {}
+        # Periodic Hann window, as scipy.signal.windows.hann(sym=False) builds it
+        self._hann = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(STFT_N_FFT) / STFT_N_FFT)).astype(np.float32)
+        
+        # Keep one HTTP session alive so repeated lookups skip the TCP/TLS handshake
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers["Accept-Encoding"] = "gzip"
+        
+        # AcoustID allows 3 requests/second per client, as pyacoustid enforces
+        self._request_lock = threading.Lock()
+        self._last_request = 0.0
+        
+        # fpcalc output is deterministic, so reuse it for unchanged files
+        self._fp_cache = None
+        if fingerprint_cache:
+            try:
+                FINGERPRINT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                self._fp_cache = shelve.open(str(FINGERPRINT_CACHE_PATH))
+            except Exception as e:
+                print(f"⚠️  Warning: Fingerprint cache unavailable: {e}")
+        
+    def close(self):
+        """
+        Release the pooled HTTP connections and the fingerprint cache
+        """
+        self._session.close()
+        self._workspace.clear()
+        if self._fp_cache is not None:
+            try:
+                self._fp_cache.close()
+            except Exception:
+                pass
+            self._fp_cache = None
+        
+    def _buffer(self, name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        """
+        Return a workspace array of the given shape, reusing earlier allocations
+        
+        Contents are uninitialized and are overwritten by the next caller
+        asking for the same name.
+        """
+        size = int(np.prod(shape))
+        backing = self._workspace.get(name)
+        if backing is None or backing.dtype != dtype or backing.size < size:
+            backing = np.empty(size, dtype=dtype)
+            self._workspace[name] = backing
+        return backing[:size].reshape(shape)
+        
+    def _fft_backend(self):
+        """
+        Context that routes librosa's scipy.fft calls through FFTW when available
+        
+        librosa already uses real FFTs; FFTW adds cached plans and float32
+        transforms.
+        """
+        global _fftw_cache_enabled
+        try:
+            import pyfftw.interfaces.cache
+            import pyfftw.interfaces.scipy_fft
+        except ImportError:
+            return contextlib.nullcontext()
+        import scipy.fft
+        
+        # Keep FFTW plans between calls; transforms run on scipy.fft's
+        # default single worker
+        if not _fftw_cache_enabled:
+            pyfftw.interfaces.cache.enable()
+            _fftw_cache_enabled = True
+        return scipy.fft.set_backend(pyfftw.interfaces.scipy_fft)
+    
+    def _load_audio(self, audio_path: str) -> np.ndarray:
+        """
+        Load audio as mono float32 at PREPROCESS_SAMPLE_RATE
+        
+        Decodes with soundfile and resamples with a polyphase filter, falling
+        back to librosa for formats libsndfile cannot read (e.g. MP3 on
+        libsndfile < 1.1)
+        """
+        try:
+            y, orig_sr = sf.read(audio_path, dtype='float32', always_2d=False)
+        except RuntimeError:
+            y, _ = librosa.load(audio_path, sr=PREPROCESS_SAMPLE_RATE, mono=True)
+            return y
+        
+        if y.ndim > 1:
+            y = y.mean(axis=1)
+        if orig_sr != PREPROCESS_SAMPLE_RATE:
+            # Imported here: scipy.signal is slow to load and only this path needs it
+            from scipy.signal import resample_poly
+            y = resample_poly(y, PREPROCESS_SAMPLE_RATE, orig_sr)
+        return y.astype(np.float32, copy=False)
+    
+    def _denoise_audio(self, audio_path: str) -> np.ndarray:
+        """
+        Load audio and apply spectral subtraction for noise reduction
+        
+        Returns:
+            Mono 16-bit PCM samples at PREPROCESS_SAMPLE_RATE, held in a
+            workspace buffer that the next call overwrites
+        """
+        print(f"📁 Loading audio file: {os.path.basename(audio_path)}")
+        y = self._load_audio(audio_path)
+        
+        # Apply spectral subtraction for noise reduction
+        # This helps with humming and voice recordings
+        shape = (1 + STFT_N_FFT // 2, 1 + len(y) // STFT_HOP_LENGTH)
+        with self._fft_backend():
+            stft = librosa.stft(y, n_fft=STFT_N_FFT, hop_length=STFT_HOP_LENGTH,
+                                window=self._hann, dtype=np.complex64,
+                                out=self._buffer('stft', shape, np.complex64))
+        magnitude = np.abs(stft, out=self._buffer('magnitude', shape, np.float32))
+        
+        # Simple noise reduction: subtract minimum magnitude
+        # Noise floor per frequency bin is a smoothed rolling minimum over
+        # about a second, so it follows noise that changes over time
+        from scipy.ndimage import minimum_filter1d, uniform_filter1d
+        noise_min = self._buffer('noise_min', shape, np.float32)
+        noise_floor = self._buffer('noise_floor', shape, np.float32)
+        minimum_filter1d(magnitude, NOISE_WINDOW_FRAMES, axis=1, mode='nearest', output=noise_min)
+        uniform_filter1d(noise_min, NOISE_WINDOW_FRAMES, axis=1, mode='nearest', output=noise_floor)
+        
+        stft_clean = self._buffer('stft_clean', shape, np.complex64)
+        kernels = _numba_kernels()
+        if kernels:
+            denoise_stft, _ = kernels
+            denoise_stft(stft, magnitude, noise_floor, stft_clean)
+        else:
+            # Gain max(mag - 0.3 * floor, 0.1 * mag) / mag, applied to the
+            # original spectrum so its phase is kept without an angle/exp
+            # round-trip. Silent bins stay silent whatever their gain.
+            np.maximum(magnitude, np.finfo(np.float32).tiny, out=magnitude)
+            gain = np.divide(noise_floor, magnitude, out=noise_floor)
+            np.multiply(gain, -0.3, out=gain)
+            np.add(gain, 1.0, out=gain)
+            np.maximum(gain, 0.1, out=gain)
+            np.multiply(stft, gain, out=stft_clean)
+        with self._fft_backend():
+            y_clean = librosa.istft(stft_clean, n_fft=STFT_N_FFT, hop_length=STFT_HOP_LENGTH,
+                                    window=self._hann, length=len(y),
+                                    out=self._buffer('y_clean', (len(y),), np.float32))
+        
+        # Normalize to 16-bit
+        return _to_pcm16(y_clean, out=self._buffer('pcm16', y_clean.shape, np.int16))
+    
     def preprocess_audio(self, audio_path: str, output_path: str = None) -> str:
         """
         Preprocess audio file for better recognition
@@ -49,41 +281,12 @@ class AudioRecognizer:
         - Apply noise reduction for humming/voice
         """
         try:
-            # Load audio with librosa
-            print(f"📁 Loading audio file: {os.path.basename(audio_path)}")
-            y, sr = librosa.load(audio_path, sr=22050, mono=True)
-            
-            # Apply spectral subtraction for noise reduction
-            # This helps with humming and voice recordings
-            stft = librosa.stft(y)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            # Simple noise reduction: subtract minimum magnitude
-            noise_floor = np.percentile(magnitude, 20, axis=1, keepdims=True)
-            magnitude_clean = np.maximum(magnitude - 0.3 * noise_floor, 
-                                       0.1 * magnitude)
-            
-            # Reconstruct audio
-            stft_clean = magnitude_clean * np.exp(1j * phase)
-            y_clean = librosa.istft(stft_clean)
+            pcm = self._denoise_audio(audio_path)
             
             # Save preprocessed audio
             if output_path is None:
                 output_path = tempfile.mktemp(suffix='.wav')
-            
-            # Normalize to 16-bit
-            y_clean = np.clip(y_clean, -1.0, 1.0)
-            y_clean = (y_clean * 32767).astype(np.int16)
-            
-            # Create AudioSegment and export
-            audio = AudioSegment(
-                y_clean.tobytes(),
-                frame_rate=22050,
-                sample_width=2,
-                channels=1
-            )
-            audio.export(output_path, format="wav")
+            sf.write(output_path, pcm, PREPROCESS_SAMPLE_RATE, subtype='PCM_16')
             print(f"✅ Audio preprocessed successfully")
             
             return output_path
@@ -93,40 +296,203 @@ class AudioRecognizer:
             print(f"📄 Using original file: {audio_path}")
             return audio_path  # Return original if preprocessing fails
     
-    def lookup_acoustid(self, path: str, max_results: int) -> Optional[List[Dict]]:
+    def _api_request(self, params: Dict) -> Dict:
+        """
+        POST a lookup request over the shared session
+        
+        Requests are spaced at least acoustid.REQUEST_INTERVAL apart.
+        
+        Returns:
+            Parsed JSON response
+        """
+        with self._request_lock:
+            since_last_request = time.monotonic() - self._last_request
+            if since_last_request < acoustid.REQUEST_INTERVAL:
+                time.sleep(acoustid.REQUEST_INTERVAL - since_last_request)
+            self._last_request = time.monotonic()
+            try:
+                response = self._session.post(ACOUSTID_LOOKUP_URL, data=params, timeout=30)
+                data = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                raise acoustid.WebServiceError(f"HTTP request failed: {e}")
+        if data.get("status") != "ok":
+            error = data.get("error", {}).get("message", "unknown error")
+            raise acoustid.WebServiceError(error)
+        return data
+    
+    def _lookup(self, duration: float, fingerprint) -> Iterator:
+        """
+        Look up a precomputed fingerprint
+        
+        Returns:
+            Iterator of (score, recording_id, title, artist) tuples
+        """
+        data = self._api_request({
+            "format": "json",
+            "client": self.acoustid_api_key,
+            "duration": int(duration),
+            "fingerprint": fingerprint,
+            "meta": "recordings",
+        })
+        return acoustid.parse_lookup_result(data)
+    
+    def _build_results(self, matches: Iterator, max_results: int) -> List[Dict]:
+        """
+        Convert (score, recording_id, title, artist) tuples into result dicts
+        """
+        results = []
+        for score, recording_id, title, artist in matches:
+            if not (recording_id and title):
+                continue
+            results.append({
+                "score": score,
+                "recording_id": recording_id,
+                "title": title,
+                "artist": artist
+            })
+            if len(results) >= max_results:
+                break
+        return results
+    
+    def _fp_cache_key(self, path: str) -> Optional[str]:
+        """
+        Cache key that changes whenever the file is modified
+        
+        Take it before fingerprinting: if the file changes meanwhile, the
+        result lands under the stale key and is never served for the new
+        content. Returns None, skipping the cache for this file, when the
+        cache is off or the file cannot be stat'ed.
+        """
+        if self._fp_cache is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return f"{os.path.abspath(path)}:{stat.st_mtime}:{stat.st_size}"
+    
+    def _cached_fingerprint(self, key: Optional[str]) -> Optional[Tuple[float, bytes]]:
+        """
+        Return the cached (duration, fingerprint) stored under a key, if any
+        """
+        if key is None or self._fp_cache is None:
+            return None
+        try:
+            return self._fp_cache.get(key)
+        except Exception as e:
+            self._disable_fp_cache(e)
+            return None
+    
+    def _cache_fingerprint(self, key: Optional[str], duration: float, fingerprint):
+        """
+        Remember a (duration, fingerprint) under a key from _fp_cache_key
+        """
+        if key is None or self._fp_cache is None:
+            return
+        try:
+            self._fp_cache[key] = (duration, fingerprint)
+        except Exception as e:
+            self._disable_fp_cache(e)
+    
+    def _disable_fp_cache(self, error: Exception):
+        """
+        Stop using a failing fingerprint cache; it is only an optimization
+        """
+        print(f"⚠️  Warning: Fingerprint cache disabled: {error}")
+        try:
+            self._fp_cache.close()
+        except Exception:
+            pass
+        self._fp_cache = None
+    
+    def lookup_acoustid(self, path: str, max_results: int, cache: bool = True) -> Optional[List[Dict]]:
+        """
+        Fingerprint an audio file and look it up in AcoustID database
+        
+        Args:
+            path: Path to audio file
+            max_results: Maximum number of results to return
+            cache: Reuse and store the fingerprint in the on-disk cache
+        
+        Returns:
+            List of matching results with acoustid
+        """
+        key = self._fp_cache_key(path) if cache else None
+        cached = self._cached_fingerprint(key)
+        if cached:
+            duration, fingerprint = cached
+        else:
+            try:
+                duration, fingerprint = acoustid.fingerprint_file(path)
+            except Exception as e:
+                print(f"❌ Error fingerprinting audio: {e}")
+                return None
+            self._cache_fingerprint(key, duration, fingerprint)
+        return self.lookup_fingerprint(duration, fingerprint, max_results)
+    
+    def lookup_denoised(self, audio_path: str, max_results: int) -> Optional[List[Dict]]:
+        """
+        Denoise an audio file and look it up in AcoustID database
+        
+        The denoised samples are fingerprinted in memory with libchromaprint
+        instead of being written to disk for fpcalc.
+        
+        Returns:
+            List of matching results with acoustid
+        """
+        try:
+            pcm = self._denoise_audio(audio_path)
+        except Exception as e:
+            print(f"⚠️  Warning: Audio preprocessing failed: {e}")
+            print(f"📄 Using original file: {audio_path}")
+            return self.lookup_acoustid(audio_path, max_results)
+        print(f"✅ Audio preprocessed successfully")
+        
+        try:
+            # Chromaprint only looks at the start of the track
+            fingerprinter = acoustid.chromaprint.Fingerprinter()
+            fingerprinter.start(PREPROCESS_SAMPLE_RATE, 1)
+            fingerprinter.feed(pcm[:acoustid.MAX_AUDIO_LENGTH * PREPROCESS_SAMPLE_RATE].tobytes())
+            fingerprint = fingerprinter.finish()
+        except Exception as e:
+            print(f"❌ Error fingerprinting audio: {e}")
+            return None
+        return self.lookup_fingerprint(len(pcm) / PREPROCESS_SAMPLE_RATE, fingerprint, max_results)
+    
+    def lookup_fingerprint(self, duration: float, fingerprint, max_results: int) -> Optional[List[Dict]]:
         """
-        Look up fingerprint in AcoustID database
+        Look up a precomputed fingerprint in AcoustID database
         
         Returns:
             List of matching results with acoustid
         """
         try:
             print(f"🔎 Searching AcoustID database...")
-            results = []
-            for score, recording_id, title, artist in acoustid.match(self.acoustid_api_key, path):
-                if(recording_id and title and len(results) < max_results):
-                    results.append({
-                        "score": score,
-                        "recording_id": recording_id,
-                        "title": title,
-                        "artist": artist
-                    })
-            return results
+            return self._build_results(self._lookup(duration, fingerprint), max_results)
             
         except Exception as e:
-            print(f"❌ Error looking up AcoustID: {e}")
-            if "Invalid API key" in str(e):
-                print("🔑 Please check your AcoustID API key")
-                print("🌐 Get a new key from: https://acoustid.org/new-application")
+            self._report_lookup_error(e)
             return None
     
-    def recognize_audio(self, audio_path: str, max_results: int = 3) -> List[Dict]:
+    def _report_lookup_error(self, error: Exception):
+        """
+        Explain a failed AcoustID lookup, pointing at the API key if rejected
+        """
+        print(f"❌ Error looking up AcoustID: {error}")
+        if "invalid api key" in str(error).lower():
+            print("🔑 Please check your AcoustID API key")
+            print("🌐 Get a new key from: https://acoustid.org/new-application")
+    
+    def recognize_audio(self, audio_path: str, max_results: int = 3,
+                        preprocess: bool = False) -> List[Dict]:
         """
         Main recognition function
         
         Args:
             audio_path: Path to audio file
             max_results: Maximum number of results to return
+            preprocess: Apply noise reduction before lookup (useful for
+                noisy or hummed recordings, wasted work for clean files)
             
         Returns:
             List of recognition results with detailed information
@@ -140,8 +506,44 @@ class AudioRecognizer:
             print(f"❌ File not found: {audio_path}")
             return []
         
-        # Look up in AcoustID
-        matches = self.lookup_acoustid(audio_path, max_results)
+        # Look up in AcoustID, optionally denoising first
+        if not preprocess:
+            matches = self.lookup_acoustid(audio_path, max_results)
+        elif acoustid.have_chromaprint:
+            matches = self.lookup_denoised(audio_path, max_results)
+        else:
+            # fpcalc can only read files, so write the denoised audio out
+            lookup_path = self.preprocess_audio(audio_path)
+            try:
+                matches = self.lookup_acoustid(lookup_path, max_results, cache=False)
+            finally:
+                if lookup_path != audio_path and os.path.exists(lookup_path):
+                    os.unlink(lookup_path)
+        return self._report_matches(matches)
+    
+    def recognize_fingerprint(self, duration: float, fingerprint, max_results: int = 3) -> List[Dict]:
+        """
+        Recognition from a fingerprint computed elsewhere (e.g. a live recording)
+        
+        Args:
+            duration: Length of the fingerprinted audio in seconds
+            fingerprint: Compressed Chromaprint fingerprint
+            max_results: Maximum number of results to return
+            
+        Returns:
+            List of recognition results with detailed information
+        """
+        print(f"\n🎧 Starting audio recognition")
+        print(f"🎤 Recording: {duration:.0f} seconds")
+        print("=" * 50)
+        
+        matches = self.lookup_fingerprint(duration, fingerprint, max_results)
+        return self._report_matches(matches)
+    
+    def _report_matches(self, matches: Optional[List[Dict]]) -> List[Dict]:
+        """
+        Explain an empty lookup and normalize it to an empty list
+        """
         if not matches:
             print("😞 No matches found in AcoustID database")
             print("\n💡 This could be because:")
@@ -152,10 +554,115 @@ class AudioRecognizer:
             print("   • The song doesn't have copyright, i.e. classical music")
             return []
         return matches
+    
+    def recognize_audio_batch(self, paths: List[str], max_results: int = 3) -> Dict[str, List[Dict]]:
+        """
+        Recognize several files with a single AcoustID request
+        
+        Fingerprints are computed in parallel across processes, then all of
+        them are submitted in one batched lookup.
+        
+        Args:
+            paths: Paths to audio files
+            max_results: Maximum number of results to return per file
+            
+        Returns:
+            Mapping of file path to its list of recognition results
+        """
+        print(f"\n🎧 Starting batch recognition of {len(paths)} file(s)")
+        print("=" * 50)
+        
+        results = {path: [] for path in paths}
+        existing = [path for path in paths if os.path.exists(path)]
+        for path in paths:
+            if path not in existing:
+                print(f"❌ File not found: {path}")
+        if not existing:
+            return results
+        
+        # Reuse cached fingerprints, run fpcalc for the rest in parallel
+        fingerprints = []
+        uncached = []
+        keys = {path: self._fp_cache_key(path) for path in existing}
+        for path in existing:
+            cached = self._cached_fingerprint(keys[path])
+            if cached:
+                fingerprints.append((path, *cached))
+            else:
+                uncached.append(path)
+        
+        if uncached:
+            print(f"🔍 Fingerprinting {len(uncached)} file(s)...")
+            with ProcessPoolExecutor(max_workers=min(len(uncached), os.cpu_count() or 1)) as executor:
+                futures = [(path, executor.submit(acoustid.fingerprint_file, path)) for path in uncached]
+                for path, future in futures:
+                    try:
+                        duration, fingerprint = future.result()
+                    except Exception as e:
+                        print(f"⚠️  Warning: Could not fingerprint {os.path.basename(path)}: {e}")
+                        continue
+                    self._cache_fingerprint(keys[path], duration, fingerprint)
+                    fingerprints.append((path, duration, fingerprint))
+        if not fingerprints:
+            return results
+        
+        # Submit every fingerprint in one request
+        params = {
+            "format": "json",
+            "client": self.acoustid_api_key,
+            "meta": "recordings",
+            "batch": 1,
+        }
+        for i, (path, duration, fingerprint) in enumerate(fingerprints):
+            params[f"duration.{i}"] = int(duration)
+            params[f"fingerprint.{i}"] = fingerprint
+        
+        try:
+            print(f"🔎 Searching AcoustID database...")
+            data = self._api_request(params)
+        except Exception as e:
+            self._report_lookup_error(e)
+            return results
+        
+        for entry in data.get("fingerprints", []):
+            path = fingerprints[int(entry["index"])][0]
+            matches = acoustid.parse_lookup_result({"status": "ok", "results": entry.get("results", [])})
+            results[path] = self._build_results(matches, max_results)
+        return results
+
+def print_results(results: List[Dict]):
+    """
+    Print recognition results, or tips if nothing matched
+    """
+    if not results:
+        print("\n😞 No matches found!")
+        print("\n💡 Tips for better recognition:")
+        print("   • Try popular, well-known songs")
+        print("   • Use clear, high-quality audio")
+        print("   • Record for 15+ seconds")
+        print("   • For humming: stay on pitch and hum the main melody")
+    else:
+        print(f"\n🎉 Found {len(results)} match(es)!")
+        print("=" * 60)
+        
+        for i, result in enumerate(results, 1):
+            print(f"\n🏆 Match #{i} (Confidence: {result['score']:.1%})")
+            print(f"🎵 Title: {result['title']}")
+            print(f"🎤 Artist(s): {result['artist']}")
+            
+            if i < len(results):
+                print("-" * 40)
 
-def record_audio(duration: int = 10, sample_rate: int = 22050) -> str:
+def record_audio(duration: int = 10, sample_rate: int = 22050) -> Optional[Tuple[float, bytes]]:
     """
     Record audio from microphone (requires pyaudio)
+    
+    With libchromaprint, audio is fed to Chromaprint as it is captured and
+    no temporary file is written. Otherwise the recording is saved to a
+    temporary WAV and fingerprinted with fpcalc.
+    
+    Returns:
+        (duration, fingerprint) of the recording
     """
     try:
         import pyaudio
@@ -180,10 +687,21 @@ def record_audio(duration: int = 10, sample_rate: int = 22050) -> str:
                        input=True,
                        frames_per_buffer=chunk)
         
-        frames = []
-        for i in range(0, int(sample_rate / chunk * duration)):
+        n_chunks = int(sample_rate / chunk * duration)
+        fingerprinter = None
+        samples = None
+        if acoustid.have_chromaprint:
+            fingerprinter = acoustid.chromaprint.Fingerprinter()
+            fingerprinter.start(sample_rate, channels)
+        else:
+            samples = np.empty(n_chunks * chunk * channels, dtype=np.int16)
+        
+        for i in range(0, n_chunks):
             data = stream.read(chunk)
-            frames.append(data)
+            if fingerprinter:
+                fingerprinter.feed(data)
+            else:
+                samples[i * chunk * channels:(i + 1) * chunk * channels] = np.frombuffer(data, dtype=np.int16)
             if i % (sample_rate // chunk) == 0:  # Print every second
                 remaining = duration - (i // (sample_rate // chunk))
                 print(f"⏱️  {remaining} seconds remaining...")
@@ -193,17 +711,23 @@ def record_audio(duration: int = 10, sample_rate: int = 22050) -> str:
         stream.close()
         p.terminate()
         
-        # Save to temporary file
-        temp_file = tempfile.mktemp(suffix='.wav')
-        wf = wave.open(temp_file, 'wb')
-        wf.setnchannels(channels)
-        wf.setsampwidth(p.get_sample_size(format))
-        wf.setframerate(sample_rate)
-        wf.writeframes(b''.join(frames))
-        wf.close()
+        print(f"✅ Recording complete!")
+        if fingerprinter:
+            return n_chunks * chunk / sample_rate, fingerprinter.finish()
         
-        print(f"✅ Recording complete! Saved to: {temp_file}")
-        return temp_file
+        # No libchromaprint: fpcalc can only read files
+        temp_file = tempfile.mktemp(suffix='.wav')
+        try:
+            wf = wave.open(temp_file, 'wb')
+            wf.setnchannels(channels)
+            wf.setsampwidth(p.get_sample_size(format))
+            wf.setframerate(sample_rate)
+            wf.writeframes(samples)
+            wf.close()
+            return acoustid.fingerprint_file(temp_file)
+        finally:
+            if os.path.exists(temp_file):
+                os.unlink(temp_file)
         
     except ImportError:
         print("❌ PyAudio not installed. Install with: pip install pyaudio")
@@ -222,6 +746,8 @@ def main():
             python audio_recognizer.py --api-key YOUR_KEY --file song.mp3
             python audio_recognizer.py --api-key YOUR_KEY --record 15
             python audio_recognizer.py --file song.wav --max-results 5
+            python audio_recognizer.py --file a.mp3 b.mp3 c.flac
+            python audio_recognizer.py --file humming.wav --denoise
 
             Get your free API key from: https://acoustid.org/new-application
         """
@@ -229,10 +755,12 @@ def main():
     
     parser.add_argument('--api-key', 
                        help='AcoustID API key (or set ACOUSTID_API_KEY in .env)')
-    parser.add_argument('--file', 
-                       help='Audio file to recognize (MP3, WAV, FLAC, etc.)')
+    parser.add_argument('--file', nargs='+',
+                       help='Audio file(s) to recognize (MP3, WAV, FLAC, etc.)')
     parser.add_argument('--record', type=int, default=0, 
                        help='Record from microphone for N seconds')
+    parser.add_argument('--denoise', action='store_true',
+                       help='Apply noise reduction to --file input before lookup')
     parser.add_argument('--max-results', type=int, default=3, 
                        help='Maximum number of results to show (1-10)')
     
@@ -256,51 +784,51 @@ def main():
     # Validate max_results
     args.max_results = max(1, min(10, args.max_results))
     
-    # Initialize recognizer
-    recognizer = AudioRecognizer(api_key)
-    
     # Determine audio source
     audio_path = None
+    recording = None
     
     if args.record > 0:
-        # Record from microphone
-        audio_path = record_audio(args.record)
-        if not audio_path:
+        # Record from microphone; it is fingerprinted while capturing
+        if args.denoise:
+            print("⚠️  Warning: --denoise is ignored when recording")
+        recording = record_audio(args.record)
+        if not recording:
             print("❌ Failed to record audio")
             return
     elif args.file:
-        # Use provided file
-        if not os.path.exists(args.file):
-            print(f"❌ File not found: {args.file}")
+        # Use provided file(s); batch mode reports missing files per file
+        audio_path = args.file[0]
+        if len(args.file) == 1 and not os.path.exists(audio_path):
+            print(f"❌ File not found: {audio_path}")
             return
-        audio_path = args.file
     else:
         print("❌ Please provide either --file or --record option")
         print("💡 Use --help for usage examples")
         return
     
+    # Initialize recognizer once the input is known to be usable, so
+    # early exits above leave no session or cache open
+    recognizer = AudioRecognizer(api_key)
+    
     try:
-        # Recognize audio
-        results = recognizer.recognize_audio(audio_path, args.max_results)
-        
-        if not results:
-            print("\n😞 No matches found!")
-            print("\n💡 Tips for better recognition:")
-            print("   • Try popular, well-known songs")
-            print("   • Use clear, high-quality audio")
-            print("   • Record for 15+ seconds")
-            print("   • For humming: stay on pitch and hum the main melody")
+        if recording:
+            duration, fingerprint = recording
+            results = recognizer.recognize_fingerprint(duration, fingerprint, args.max_results)
+            print_results(results)
+        elif len(args.file) > 1:
+            # Recognize several files with one batched lookup
+            if args.denoise:
+                print("⚠️  Warning: --denoise is ignored when recognizing several files")
+            batch_results = recognizer.recognize_audio_batch(args.file, args.max_results)
+            for path, results in batch_results.items():
+                print(f"\n📂 {path}")
+                print_results(results)
         else:
-            print(f"\n🎉 Found {len(results)} match(es)!")
-            print("=" * 60)
-            
-            for i, result in enumerate(results, 1):
-                print(f"\n🏆 Match #{i} (Confidence: {result['score']:.1%})")
-                print(f"🎵 Title: {result['title']}")
-                print(f"🎤 Artist(s): {result['artist']}")
-                
-                if i < len(results):
-                    print("-" * 40)
+            # Recognize audio
+            results = recognizer.recognize_audio(audio_path, args.max_results,
+                                                 preprocess=args.denoise)
+            print_results(results)
     
     except KeyboardInterrupt:
         print("\n\n⏹️  Recognition stopped by user")
@@ -308,10 +836,7 @@ def main():
         print(f"\n❌ Unexpected error: {e}")
         print("💡 Please check your internet connection and try again")
     finally:
-        # Clean up recorded file
-        if args.record > 0 and audio_path and os.path.exists(audio_path):
-            os.unlink(audio_path)
-            print(f"\n🗑️  Cleaned up temporary recording file")
+        recognizer.close()
 
 if __name__ == "__main__":
     if len(sys.argv) == 1:
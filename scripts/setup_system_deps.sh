@@ -8,6 +8,7 @@ if [[ "$OSTYPE" == "linux-gnu"* ]]; then
     sudo apt update
     sudo apt install -y \
         ffmpeg \
+        libchromaprint-tools \
         libffi-dev \
         libasound2-dev \
         portaudio19-dev \
@@ -23,18 +24,19 @@ elif [[ "$OSTYPE" == "darwin"* ]]; then
         exit 1
     fi
     
-    brew install ffmpeg portaudio
+    brew install ffmpeg portaudio chromaprint
     
 elif [[ "$OSTYPE" == "msys" ]] || [[ "$OSTYPE" == "win32" ]]; then
     echo "Detected Windows"
     echo "Please install the following manually:"
     echo "1. FFmpeg: https://ffmpeg.org/download.html"
     echo "2. Visual Studio Build Tools or Visual Studio Community"
-    echo "3. Add FFmpeg to your PATH"
+    echo "3. Chromaprint (fpcalc): https://acoustid.org/chromaprint"
+    echo "4. Add FFmpeg and fpcalc to your PATH"
     
 else
     echo "Unknown OS: $OSTYPE"
-    echo "Please install ffmpeg and portaudio manually"
+    echo "Please install ffmpeg, portaudio and chromaprint manually"
 fi
 
 echo "System dependencies setup complete!"
\ No newline at end of file